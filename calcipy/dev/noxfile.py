@@ -32,10 +32,12 @@ with open(path_stdout, 'w') as out:
 
 """
 
+import hashlib
+import os
 import re
 import shlex
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable, Dict
 from urllib.parse import urlparse
 from urllib.request import url2pathname
 
@@ -47,6 +49,7 @@ from ..file_helpers import if_found_unlink
 
 has_test_imports = False
 try:
+    import nox
     from nox_poetry import session
     from nox_poetry.poetry import DistributionFormat
     from nox_poetry.sessions import Session
@@ -54,7 +57,15 @@ try:
 except ImportError:  # pragma: no cover
     pass
 
+_RE_POETRY_RUN = re.compile(r'^poetry run ')
+"""Compiled regular expression to match the `poetry run` prefix of doit command strings."""
+
 if has_test_imports:  # pragma: no cover  # noqa: C901
+    # Opt-in to a faster backend, such as `uv|virtualenv`, with the `CALCIPY_NOX_BACKEND` environment variable
+    #   uv isn't the default because nox_poetry runs `pip uninstall`, but uv virtual environments don't include pip
+    if 'CALCIPY_NOX_BACKEND' in os.environ:
+        nox.options.default_venv_backend = os.environ['CALCIPY_NOX_BACKEND']
+
     def _run_str_cmd(session: Session, cmd_str: str) -> None:
         """Run a command string. Ensure that poetry is left-stripped.
 
@@ -63,7 +74,7 @@ if has_test_imports:  # pragma: no cover  # noqa: C901
             cmd_str: string command to run
 
         """
-        cmd_str = re.sub(r'^poetry run ', '', cmd_str)
+        cmd_str = _RE_POETRY_RUN.sub('', cmd_str)
         session.run(*shlex.split(cmd_str), stdout=True)
 
     def _run_func_cmd(action: DoitAction) -> None:
@@ -82,6 +93,13 @@ if has_test_imports:  # pragma: no cover  # noqa: C901
         if result not in [True, None] or not isinstance(result, (str, dict)):
             raise RuntimeError(f'Returned {result}. Failed to run task: {action}')
 
+    _ACTION_HANDLERS: Dict[type, Callable[[Session, Any], None]] = {
+        str: _run_str_cmd,
+        list: lambda _session, action: _run_func_cmd(action),
+        tuple: lambda _session, action: _run_func_cmd(action),
+    }
+    """Lookup of the exact action type to the function that runs it. Other types fall back to attribute checks."""
+
     def _run_doit_task(session: Session, task_fun: Callable[[], DoitTask]) -> None:
         """Run a DoitTask actions without using doit.
 
@@ -95,8 +113,9 @@ if has_test_imports:  # pragma: no cover  # noqa: C901
         """
         task = task_fun()
         for action in task['actions']:
-            if isinstance(action, str):
-                _run_str_cmd(session, action)
+            handler = _ACTION_HANDLERS.get(type(action))
+            if handler:
+                handler(session, action)
             elif getattr(action, 'action', None):
                 _run_str_cmd(session, action.action)
             elif isinstance(action, (list, tuple)):
@@ -104,6 +123,24 @@ if has_test_imports:  # pragma: no cover  # noqa: C901
             else:
                 raise NotImplementedError(f'Unable to run {action} ({type(action)})')
 
+    def _install_dev(session: Session) -> None:
+        """Install the package with the development and test extras into a reused session venv.
+
+        nox always creates one venv per session, so the full dependency install is only repeated when `poetry.lock`
+        has changed since the venv was last populated. Otherwise, only the local package is reinstalled
+
+        Args:
+            session: nox_poetry Session
+
+        """
+        digest = hashlib.sha256((DG.meta.path_project / 'poetry.lock').read_bytes()).hexdigest()
+        path_hash = Path(session.virtualenv.location) / '.calcipy_lock.hash'
+        if path_hash.is_file() and path_hash.read_text() == digest:
+            session.install('--no-deps', '.')
+        else:
+            session.install('.[dev]', '.[test]')
+            path_hash.write_text(digest)
+
     @session(python=DG.test.pythons, reuse_venv=True)
     def tests(session: Session) -> None:
         """Run doit test task for specified python versions.
@@ -112,7 +149,7 @@ if has_test_imports:  # pragma: no cover  # noqa: C901
             session: nox_poetry Session
 
         """
-        session.install('.[dev]', '.[test]')
+        _install_dev(session)
         _run_doit_task(session, task_test)
 
     @session(python=[DG.test.pythons[-1]], reuse_venv=True)
@@ -123,7 +160,7 @@ if has_test_imports:  # pragma: no cover  # noqa: C901
             session: nox_poetry Session
 
         """
-        session.install('.[dev]', '.[test]')
+        _install_dev(session)
         _run_doit_task(session, task_coverage)
 
     @session(python=[DG.test.pythons[-1]], reuse_venv=False)
@@ -1,6 +1,5 @@
 """General doit Utilities."""
 
-import webbrowser
 from collections import defaultdict
 from pathlib import Path
 from typing import Iterable
@@ -43,7 +42,8 @@ def debug_task(actions: Iterable[DoitAction], verbosity: int = 2) -> DoitTask:
     task['actions'] = actions
     task['title'] = _show_cmd
     task['verbosity'] = verbosity
-    logger.debug('Created task. See extras', task=f'{task}')
+    # Formatting the task is only necessary when debug logging is enabled, so defer it with a lazy callable
+    logger.opt(lazy=True).debug('Created task. See extras', task=lambda: f'{task}')
     return task
 
 
@@ -70,6 +70,20 @@ def write_text(path_file: Path, text: str) -> None:
     path_file.write_text(text)  # pragma: no cover
 
 
+@beartype
+def open_url(url: str) -> None:
+    """Open the URL in the default web browser.
+
+    > Note: `webbrowser` is imported when called rather than on every import of the doit tasks
+
+    Args:
+        url: URL to open
+
+    """
+    import webbrowser
+    webbrowser.open(url)  # pragma: no cover
+
+
 @beartype
 def open_in_browser(path_file: Path) -> None:
     """Open the path in the default web browser.
@@ -78,4 +92,4 @@ def open_in_browser(path_file: Path) -> None:
         path_file: Path to file
 
     """
-    webbrowser.open(Path(path_file).as_uri())  # pragma: no cover
+    open_url(Path(path_file).as_uri())  # pragma: no cover
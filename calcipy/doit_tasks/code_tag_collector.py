@@ -1,14 +1,18 @@
 """Collect code tags and output for review in a single location."""
 
-from collections import defaultdict
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Pattern, Sequence
+from typing import Iterable, List, Pattern, Sequence
 
 import attr
 from beartype import beartype
 from loguru import logger
 
-from ..file_helpers import read_lines
+from ..file_helpers import iter_lines, write_if_changed
 from ..log_helpers import log_fun
 from .base import debug_task
 from .doit_globals import DG, DoitTask
@@ -16,8 +20,18 @@ from .doit_globals import DG, DoitTask
 SKIP_PHRASE = 'calcipy:skip_tags'
 """String that indicates the file should be excluded from the tag search."""
 
+_PARALLEL_THRESHOLD = 500
+"""Minimum number of files to search in worker processes.
 
-@attr.s(auto_attribs=True)
+Searching a typical source file takes ~0.1 ms, while starting the process pool takes ~50 ms.
+
+"""
+
+_CPU_COUNT = os.cpu_count() or 1
+"""Number of CPUs available to the process pool."""
+
+
+@attr.s(auto_attribs=True, slots=True)
 class _CodeTag:  # noqa: H601
     """Code Tag (FIXME,TODO,etc) with contextual information."""  # noqa: T100,T101
 
@@ -26,7 +40,7 @@ class _CodeTag:  # noqa: H601
     text: str
 
 
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class _Tags:  # noqa: H601
     """Collection of code tags with additional contextual information."""
 
@@ -36,57 +50,143 @@ class _Tags:  # noqa: H601
 
 @beartype
 def _search_lines(
-    lines: List[str], regex_compiled: Pattern[str],
+    lines: Iterable[str], regex_compiled: Pattern[str],
     skip_phrase: str = 'calcipy:skip_tags',
 ) -> List[_CodeTag]:
     """Search lines of text for matches to the compiled regular expression.
 
     Args:
-        lines: lines of text as list
+        lines: lines of text. Can be a lazy iterator, such as `iter_lines`
         regex_compiled: compiled regular expression. Expected to have matching groups `(tag, text)`
-        skip_phrase: skip file if string is found in final two lines. Default is `SKIP_PHRASE`
+        skip_phrase: skip file if string is found in final two lines, where a trailing newline counts as an empty
+            final line (like `read_lines`). Default is `SKIP_PHRASE`
 
     Returns:
         List[_CodeTag]: list of all code tags found in lines
 
     """
-    if skip_phrase in '\n'.join(lines[-2:]):
-        return []
-
     comments = []
+    line_prev, line_last = '', ''
     for lineno, line in enumerate(lines):
+        line_prev, line_last = line_last, line
         match = regex_compiled.search(line)
         if match:
             mg = match.groupdict()
             comments.append(_CodeTag(lineno + 1, tag=mg['tag'], text=mg['text']))
+
+    if skip_phrase in line_prev or skip_phrase in line_last:
+        return []
     return comments
 
 
 @beartype
-def _search_files(paths_source: Sequence[Path], regex_compiled: Pattern[str]) -> List[_Tags]:
-    """Collect matches from multiple files.
+def _search_bytes(
+    buf: bytes, regex_compiled: Pattern[str], tags: Sequence[str],
+    skip_phrase: str = SKIP_PHRASE,
+) -> List[_CodeTag]:
+    """Search the raw file contents for matches to the compiled regular expression.
+
+    Rather than looping over every line in Python, `bytes.find` locates the lines that contain a tag and only
+    those lines are decoded and searched with the regular expression. Like reading the file in text mode, both `CRLF`
+    and a lone `CR` are treated as line breaks
 
     Args:
-        paths_source: list of source files to parse
+        buf: raw bytes of the file
+        regex_compiled: compiled regular expression. Expected to have matching groups `(tag, text)`
+        tags: tag names used to locate the candidate lines
+        skip_phrase: skip file if string is found in final two lines, where a trailing newline counts as an empty
+            final line (like `read_lines`). Default is `SKIP_PHRASE`
+
+    Returns:
+        List[_CodeTag]: list of all code tags found in the file
+
+    """
+    # Normalize line endings like text mode (universal newlines). Most files have no carriage returns, so the copy is
+    #   usually skipped
+    if b'\r' in buf:
+        buf = buf.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+    # Equivalent to checking the last two items of `buf.split(b'\n')`, which only includes the last line of text when
+    #   the file ends with a newline
+    idx_start = buf.rfind(b'\n', 0, max(buf.rfind(b'\n'), 0)) + 1
+    if skip_phrase.encode() in buf[idx_start:]:
+        return []
+
+    # Bind the methods used in the loops to local names to skip the attribute lookup on each iteration
+    find, rfind, count, search = buf.find, buf.rfind, buf.count, regex_compiled.search
+
+    line_starts = set()
+    for token in {tag.encode() for tag in tags}:
+        idx = find(token)
+        while idx >= 0:
+            line_starts.add(rfind(b'\n', 0, idx) + 1)
+            idx_eol = find(b'\n', idx)
+            idx = find(token, idx_eol) if idx_eol >= 0 else -1
+
+    # Line numbers are counted incrementally between the sorted line starts, so each byte is counted at most once
+    #   rather than re-counting from the start of the file for every match
+    comments = []
+    lineno, idx_prev = 1, 0
+    for idx_start in sorted(line_starts):
+        lineno += count(b'\n', idx_prev, idx_start)
+        idx_prev = idx_start
+        idx_eol = find(b'\n', idx_start)
+        line = buf[idx_start:idx_eol if idx_eol >= 0 else None].decode('utf-8', errors='replace')
+        match = search(line)
+        if match:
+            mg = match.groupdict()
+            comments.append(_CodeTag(lineno, tag=mg['tag'], text=mg['text']))
+    return comments
+
+
+@beartype
+def _search_file(path_source: Path, regex_compiled: Pattern[str], tags: Sequence[str] = ()) -> List[_CodeTag]:
+    """Collect matches from a single file. Defined at the module level so that it can be used in worker processes.
+
+    Args:
+        path_source: source file to parse
         regex_compiled: compiled regular expression. Expected to have matching groups `(tag, text)`
+        tags: optional tag names. If provided, the file is searched with `_search_bytes` rather than line by line
 
     Returns:
-        List[_Tags]: list of all code tags found in files
+        List[_CodeTag]: list of all code tags found in the file
 
     """
-    matches = []
-    for path_source in paths_source:
-        lines = []
-        try:
-            lines = read_lines(path_source)
-        except UnicodeDecodeError as err:
-            logger.warning(f'Could not parse: {path_source}', err=err)
+    comments: List[_CodeTag]
+    if tags and path_source.is_file():
+        comments = _search_bytes(path_source.read_bytes(), regex_compiled, tags=tags)
+    else:
+        comments = _search_lines(iter_lines(path_source), regex_compiled)
+    return comments
 
-        comments = _search_lines(lines, regex_compiled)
-        if comments:
-            matches.append(_Tags(path_source, comments))
 
-    return matches
+@beartype
+def _search_files(
+    paths_source: Sequence[Path], regex_compiled: Pattern[str], tags: Sequence[str] = (),
+) -> List[_Tags]:
+    """Collect matches from multiple files.
+
+    > Note: each file is independent, so larger projects are searched in parallel across processes
+
+    Args:
+        paths_source: list of source files to parse
+        regex_compiled: compiled regular expression. Expected to have matching groups `(tag, text)`
+        tags: optional tag names. If provided, files are searched with `_search_bytes` rather than line by line
+
+    Returns:
+        List[_Tags]: list of all code tags found in files, sorted by `path_source`
+
+    """
+    args = (paths_source, repeat(regex_compiled), repeat(tuple(tags)))
+    if len(paths_source) > _PARALLEL_THRESHOLD and _CPU_COUNT > 1:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(_search_file, *args, chunksize=16))
+    else:
+        results = list(map(_search_file, *args))
+    # git lists files in byte order, which differs from Path ordering, so sort once here where only tagged files remain
+    tagged = [_Tags(path_source, comments) for path_source, comments in zip(paths_source, results) if comments]
+    tagged.sort(key=attrgetter('path_source'))
+    return tagged
 
 
 @beartype
@@ -95,28 +195,28 @@ def _format_report(base_dir: Path, code_tags: List[_Tags]) -> str:  # noqa: CCR0
 
     Args:
         base_dir: base directory relative to the searched files
-        code_tags: list of all code tags found in files
+        code_tags: list of all code tags found in files. Expected to be sorted, such as the output of `_search_files`
 
     Returns:
         str: pretty-formatted text
 
     """
-    output = ''
-    counter: Dict[str, int] = defaultdict(lambda: 0)
-    for comments in sorted(code_tags, key=lambda tc: tc.path_source, reverse=False):
-        output += f'- {comments.path_source.relative_to(base_dir).as_posix()}\n'
-        for comment in comments.code_tags:
-            output += f'    - line {comment.lineno:>3} {comment.tag:>7}: {comment.text}\n'
-            counter[comment.tag] += 1
-        output += '\n'
+    output: List[str] = []
+    counter = Counter(comment.tag for comments in code_tags for comment in comments.code_tags)
+    for comments in code_tags:
+        output.append(f'- {comments.path_source.relative_to(base_dir).as_posix()}\n')
+        output.extend(
+            f'    - line {comment.lineno:>3} {comment.tag:>7}: {comment.text}\n' for comment in comments.code_tags
+        )
+        output.append('\n')
     logger.debug('counter={counter}', counter=counter)
 
     sorted_counter = {tag: counter[tag] for tag in DG.ct.tags if tag in counter}
     logger.debug('sorted_counter={sorted_counter}', sorted_counter=sorted_counter)
     formatted_summary = ', '.join(f'{tag} ({count})' for tag, count in sorted_counter.items())
     if formatted_summary:
-        output += f'Found code tags for {formatted_summary}\n'
-    return output
+        output.append(f'Found code tags for {formatted_summary}\n')
+    return ''.join(output)
 
 
 @log_fun
@@ -130,10 +230,10 @@ def _write_code_tag_file(path_tag_summary: Path) -> None:
     """
     header = f'# Task Summary\n\nAuto-Generated by `{DG.meta.pkg_name}`'
     regex_compiled = DG.ct.compile_issue_regex()
-    matches = _search_files(DG.meta.paths, regex_compiled)
+    matches = _search_files(DG.meta.paths, regex_compiled, tags=DG.ct.tags)
     report = _format_report(DG.meta.path_project, matches).strip()
     if report:
-        path_tag_summary.write_text(f'{header}\n\n{report}\n\n<!-- {SKIP_PHRASE} -->\n')
+        write_if_changed(path_tag_summary, f'{header}\n\n{report}\n\n<!-- {SKIP_PHRASE} -->\n')
     elif path_tag_summary.is_file():
         path_tag_summary.unlink()
 
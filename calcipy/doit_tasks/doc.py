@@ -2,17 +2,16 @@
 
 import json
 import re
-import webbrowser
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Pattern
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern
 
 from beartype import beartype
 from doit.tools import Interactive
 from loguru import logger
-from transitions import Machine
 
 from ..file_helpers import read_lines
-from .base import debug_task, open_in_browser
+from .base import debug_task, open_in_browser, open_url
 from .doit_globals import DG, DoitTask
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -97,7 +96,7 @@ def task_cl_bump_pre() -> DoitTask:
 # Manage README Updates
 
 
-class _ReplacementMachine(Machine):  # type: ignore[misc] # noqa: H601
+class _ReplacementMachine:  # noqa: H601
     """State machine to replace content with user-specified handlers.
 
     Uses `{cts}` and `{cte}` to demarcate sections (short for calcipy_template start|end)
@@ -106,65 +105,45 @@ class _ReplacementMachine(Machine):  # type: ignore[misc] # noqa: H601
 
     def __init__(self) -> None:
         """Initialize the state machine."""
-        self.state_user = 'user'
-        self.state_auto = 'autoformatted'
-        transitions = [
-            {
-                'trigger': 'start_auto',
-                'source': self.state_user,
-                'dest': self.state_auto,
-            }, {
-                'trigger': 'end',
-                'source': self.state_auto,
-                'dest': self.state_user,
-            },
-        ]
-        super().__init__(
-            states=[self.state_user, self.state_auto],
-            initial=self.state_user,
-            transitions=transitions,
-        )
+        # True while within an autoformatted section. Otherwise, the lines belong to the user
+        self.in_auto = False
 
     def _parse_line(
         self, line: str, handler_lookup: Dict[str, Callable[[str, Path], str]],
-        path_file: Optional[Path] = None,
-    ) -> List[str]:
-        """Parse lines and insert new_text based on provided handler_lookup.
+        path_file: Optional[Path], lines: List[str],
+    ) -> None:
+        """Parse a single line and append the new_text based on provided handler_lookup.
 
         Args:
             line: single line
             handler_lookup: Lookup dictionary for autoformatted sections
             path_file: optional path to the file. Only useful for debugging
-
-        Returns:
-            List[str]: modified list of strings
+            lines: modified list of strings. Mutated in place to avoid allocating a new list for every line
 
         """
-        lines: List[str] = []
-        if '{cte}' in line and self.state == self.state_auto:  # end
-            self.end()
+        if '{cte}' in line and self.in_auto:  # end
+            self.in_auto = False
         elif '{cts}' in line:  # start
-            self.start_auto()
-            matches = [text_match for text_match in handler_lookup if text_match in line]
-            if len(matches) == 1:
-                lines.extend(handler_lookup[matches[0]](line, path_file))
+            self.in_auto = True
+            handlers = [handler for text_match, handler in handler_lookup.items() if text_match in line]
+            if len(handlers) == 1:
+                lines.extend(handlers[0](line, path_file))
             else:
                 logger.error('Could not parse: {line}', line=line)
                 lines.append(line)
-                self.end()
-        elif self.state == self.state_user:
+                self.in_auto = False
+        elif not self.in_auto:
             lines.append(line)
         # else: discard the lines in the auto-section
-        return lines
 
     def parse(
-        self, lines: List[str], handler_lookup: Dict[str, Callable[[str, Path], str]],
+        self, lines: Iterable[str], handler_lookup: Dict[str, Callable[[str, Path], str]],
         path_file: Optional[Path] = None,
     ) -> List[str]:
         """Parse lines and insert new_text based on provided handler_lookup.
 
         Args:
-            lines: list of string from source file
+            lines: lines of text from the source file. Can be a lazy iterator, such as `iter_lines`
             handler_lookup: Lookup dictionary for autoformatted sections
             path_file: optional path to the file. Only useful for debugging
 
@@ -172,9 +151,9 @@ class _ReplacementMachine(Machine):  # type: ignore[misc] # noqa: H601
             List[str]: modified list of strings
 
         """
-        updated_lines = []
+        updated_lines: List[str] = []
         for line in lines:
-            updated_lines.extend(self._parse_line(line, handler_lookup, path_file))
+            self._parse_line(line, handler_lookup, path_file, updated_lines)
         return updated_lines
 
 
@@ -213,17 +192,17 @@ def _handle_source_file(line: str, path_file: Path) -> List[str]:
         List[str]: list of auto-formatted text
 
     """
-    key, path_rel = [*_parse_var_comment(line).items()][0]
+    key, path_rel = next(iter(_parse_var_comment(line).items()))
     path_base = DG.meta.path_project if path_rel.startswith('/') else path_file.resolve().parent
     path_source = path_base / path_rel.lstrip('/')
     language = path_source.suffix.lstrip('.')
-    lines_source = [f'```{language}', *read_lines(path_source), '```']
     if not path_source.is_file():
         logger.warning(f'Could not locate: {path_source}')
 
-    line_start = f'<!-- {{cts}} {key}={path_rel}; -->'
-    line_end = '<!-- {cte} -->'
-    return [line_start] + lines_source + [line_end]
+    lines = [f'<!-- {{cts}} {key}={path_rel}; -->', f'```{language}']
+    lines.extend(read_lines(path_source))
+    lines.extend(('```', '<!-- {cte} -->'))
+    return lines
 
 
 @beartype
@@ -238,14 +217,16 @@ def _format_cov_table(coverage_data: Dict[str, Any]) -> List[str]:
 
     """
     legend = ['File', 'Statements', 'Missing', 'Excluded', 'Coverage']
-    int_keys = ['num_statements', 'missing_lines', 'excluded_lines']
+    get_int_values = itemgetter('num_statements', 'missing_lines', 'excluded_lines')
     rows = [legend, ['--:'] * len(legend)]
     for path_file, file_obj in coverage_data['files'].items():
-        rel_path = Path(path_file).as_posix()  # .resolve().relative_to(DG.meta.path_project)
-        per = round(file_obj['summary']['percent_covered'], 1)
-        rows.append([f'`{rel_path}`'] + [file_obj['summary'][key] for key in int_keys] + [f'{per}%'])
+        # The paths in coverage.json are already relative, so no `resolve()` (and syscalls) are needed per file
+        rel_path = Path(path_file).as_posix()
+        summary = file_obj['summary']
+        per = round(summary['percent_covered'], 1)
+        rows.append([f'`{rel_path}`', *get_int_values(summary), f'{per}%'])
     # Format table for Github Markdown
-    lines_table = [f"| {' | '.join([str(value) for value in row])} |" for row in rows]
+    lines_table = [f"| {' | '.join(map(str, row))} |" for row in rows]
     lines_table.extend(['', f"Generated on: {coverage_data['meta']['timestamp']}"])
     # TODO: Convert to Pandas for ".to_markdown"
     #   https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.to_markdown.html
@@ -266,15 +247,13 @@ def _handle_coverage(line: str, path_file: Path) -> List[str]:
 
     """
     path_coverage = DG.meta.path_project / 'coverage.json'  # Created by "task_coverage"
-    lines_cov = []
+    lines = [line]
     if path_coverage.is_file():
-        coverage_data = json.loads(path_coverage.read_text())
-        lines_cov = _format_cov_table(coverage_data)
+        lines.extend(_format_cov_table(json.loads(path_coverage.read_text())))
     else:
         logger.warning(f'Could not locate: {path_coverage}')
-
-    line_end = '<!-- {cte} -->'
-    return [line] + lines_cov + [line_end]
+    lines.append('<!-- {cte} -->')
+    return lines
 
 
 @beartype
@@ -290,8 +269,14 @@ def write_autoformatted_md_sections() -> None:
 
     logger.info('> {paths_md}', paths_md=DG.doc.paths_md)
     for path_md in DG.doc.paths_md:
-        md_lines = _ReplacementMachine().parse(read_lines(path_md), DG.doc.handler_lookup, path_md)
-        path_md.write_text('\n'.join(md_lines))
+        # Most markdown files have no autoformatted sections, so skip splitting and rejoining the text entirely
+        text = path_md.read_text(encoding='utf-8')
+        if '{cts}' not in text:
+            continue
+        md_lines = _ReplacementMachine().parse(text.split('\n'), DG.doc.handler_lookup, path_md)
+        text_new = '\n'.join(md_lines)
+        if text_new != text:
+            path_md.write_text(text_new, encoding='utf-8')
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -356,7 +341,7 @@ def task_serve_docs() -> DoitTask:
 
     """
     return debug_task([
-        (webbrowser.open, ('http://localhost:8000',)),
+        (open_url, ('http://localhost:8000',)),
         Interactive('poetry run mkdocs serve --dirtyreload'),
     ])
 
@@ -3,7 +3,7 @@
 import inspect
 import re
 import warnings
-from functools import partial
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Set, Tuple, Union
 
@@ -17,7 +17,7 @@ from loguru import logger
 
 from ..file_helpers import get_doc_dir
 from ..log_helpers import log_fun
-from .file_search import find_project_files, find_project_files_by_suffix
+from .file_search import find_project_files, group_files_by_suffix
 
 _DOIT_TASK_IMPORT_ERROR = 'User must install the optional calcipy extra "dev" to utilize "doit_tasks"'
 """Standard error message when an optional import is not available. Raise with RuntimeError."""
@@ -110,7 +110,8 @@ class _PathAttrBase:  # noqa: H601
         for name, path_raw in self._get_members(instance_type=type(Path()), prefix=None):
             if not path_raw.is_absolute():  # type: ignore[attr-defined]
                 setattr(self, name, base_path / path_raw)  # type: ignore[operator]
-                logger.debug(f'Mutated: self.{name}={path_raw} (now: {getattr(self, name)})')
+                logger.debug('Mutated: self.{name}={path_raw} (now: {path})', name=name, path_raw=path_raw,
+                             path=getattr(self, name))
 
     def _verify_initialized_paths(self) -> None:
         """Verify that all paths are not None.
@@ -141,7 +142,7 @@ class PackageMeta(_PathAttrBase):  # noqa: H601
     """Paths to all tracked files that were not ignored with specified patterns `find_project_files`."""
 
     paths_by_suffix: Dict[str, List[Path]] = attr.ib(init=False)
-    """Paths to all tracked files that were not ignored with specified patterns `find_project_files_by_suffix`."""
+    """Paths from `paths` grouped by suffix with `group_files_by_suffix`."""
 
     pkg_name: str = attr.ib(init=False)
     """Package string name."""
@@ -174,8 +175,9 @@ class PackageMeta(_PathAttrBase):  # noqa: H601
         if '-' in self.pkg_name:  # pragma: no cover
             warnings.warn(f'Replace dashes in name with underscores ({self.pkg_name}) in {self.path_toml}')
 
+        # Search once and group the result rather than listing and checking every tracked file a second time
         self.paths = find_project_files(self.path_project, self.ignore_patterns)
-        self.paths_by_suffix = find_project_files_by_suffix(self.path_project, self.ignore_patterns)
+        self.paths_by_suffix = group_files_by_suffix(self.paths)
 
     def __shorted_path_list(self) -> Set[str]:  # pragma: no cover
         """Shorten the list of directories common to the specified paths.
@@ -220,7 +222,7 @@ class LintConfig(_PathAttrBase):  # noqa: H601
     """List of additional excluded flake8 rules for the pre-commit check."""
 
     paths_py: List[Path] = attr.ib(init=False)
-    """Paths to the Python files used when linting. Created with `find_project_files_by_suffix`."""
+    """Paths to the Python files used when linting. Created with `group_files_by_suffix`."""
 
     def __attrs_post_init__(self) -> None:
         """Finish initializing class attributes."""
@@ -278,6 +280,22 @@ class TestingConfig(_PathAttrBase):  # noqa: H601
         self.path_mypy_index = self.path_out / 'mypy_html/index.html'
 
 
+@lru_cache(maxsize=8)
+def _compile_pattern(pattern: str) -> Pattern[str]:
+    """Compile a regular expression once per unique pattern string.
+
+    The attrs config classes are mutable and unhashable, so the cache is keyed on the formatted pattern instead
+
+    Args:
+        pattern: regular expression string
+
+    Returns:
+        Pattern[str]: compiled regular expression
+
+    """
+    return re.compile(pattern)
+
+
 @attr.s(auto_attribs=True, kw_only=True)
 class CodeTagConfig(_PathAttrBase):  # noqa: H601
     """Code Tag Config."""
@@ -312,7 +330,7 @@ class CodeTagConfig(_PathAttrBase):  # noqa: H601
             Pattern[str]: compiled regular expression to match all of the specified tags
 
         """
-        return re.compile(self.re_raw.format(tag='|'.join(self.tags)))
+        return _compile_pattern(self.re_raw.format(tag='|'.join(self.tags)))
 
 
 @attr.s(auto_attribs=True, kw_only=True)
@@ -329,7 +347,7 @@ class DocConfig(_PathAttrBase):  # noqa: H601
     """Lookup dictionary for autoformatted sections of the project's markdown files."""
 
     paths_md: List[Path] = attr.ib(init=False)
-    """Paths to Markdown files used when documenting. Created with `find_project_files_by_suffix`."""
+    """Paths to Markdown files used when documenting. Created with `group_files_by_suffix`."""
 
     def __attrs_post_init__(self) -> None:
         """Finish initializing class attributes."""
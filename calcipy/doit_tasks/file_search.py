@@ -39,10 +39,7 @@ def _filter_files(rel_filepaths: List[str], ignore_patterns: List[str]) -> List[
 
     """
     if ignore_patterns:
-        matches = []
-        for pth in map(Path, rel_filepaths):
-            matches.extend([pth.as_posix() for pat in ignore_patterns if pth.match(pat)][:1])
-        return [rel for rel in rel_filepaths if rel not in matches]
+        return [rel for rel in rel_filepaths if not any(map(Path(rel).match, ignore_patterns))]
     return rel_filepaths
 
 
@@ -72,6 +69,23 @@ def find_project_files(path_project: Path, ignore_patterns: List[str]) -> List[P
     return file_paths
 
 
+@beartype
+def group_files_by_suffix(file_paths: List[Path]) -> Dict[str, List[Path]]:
+    """Group file paths by suffix in a single pass.
+
+    Args:
+        file_paths: list of paths, such as the output of `find_project_files`
+
+    Returns:
+        Dict[str, List[Path]]: where keys are the suffix (without leading dot) and values the list of paths
+
+    """
+    file_lookup = defaultdict(list)
+    for path_file in file_paths:
+        file_lookup[path_file.suffix.lstrip('.')].append(path_file)
+    return file_lookup
+
+
 @beartype
 def find_project_files_by_suffix(path_project: Path, ignore_patterns: List[str]) -> Dict[str, List[Path]]:
     """Find project files in git version control.
@@ -86,7 +100,5 @@ def find_project_files_by_suffix(path_project: Path, ignore_patterns: List[str])
         Dict[str, List[Path]]: where keys are the suffix (without leading dot) and values the list of paths
 
     """
-    file_lookup = defaultdict(list)
-    for path_file in find_project_files(path_project, ignore_patterns):
-        file_lookup[path_file.suffix.lstrip('.')].append(path_file)
+    file_lookup: Dict[str, List[Path]] = group_files_by_suffix(find_project_files(path_project, ignore_patterns))
     return file_lookup
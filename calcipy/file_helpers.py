@@ -1,22 +1,65 @@
 """File Helpers."""
 
+import copy
 import os
+import re
 import shutil
 import string
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Callable, Deque, Iterator, List, Optional, Pattern, TypeVar, cast
 
 import yaml
 from beartype import beartype
 from loguru import logger
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[misc]
+
 # ----------------------------------------------------------------------------------------------------------------------
 # General
 
 ALLOWED_CHARS = string.ascii_lowercase + string.ascii_uppercase + string.digits + '-_.'
 """Default string of acceptable characters in a filename."""
 
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+
+def _maybe_beartype(fun: _F) -> _F:
+    """Only apply `beartype` when the `CALCIPY_BEARTYPE` environment variable is set.
+
+    Used for the small IO helpers that are called once per file, where the runtime type check adds per-call overhead
+
+    Args:
+        fun: function to decorate
+
+    Returns:
+        _F: the decorated function or the original function unchanged
+
+    """
+    return cast(_F, beartype(fun)) if os.environ.get('CALCIPY_BEARTYPE') else fun
+
+
+@lru_cache(maxsize=8)
+def _compile_disallowed(allowed_chars: str) -> Pattern[str]:
+    """Compile a regular expression that matches any single character not in `allowed_chars`.
+
+    Args:
+        allowed_chars: all allowed characters
+
+    Returns:
+        Pattern[str]: compiled regular expression
+
+    """
+    if not allowed_chars:
+        return re.compile('.', flags=re.DOTALL)
+    return re.compile(f'[^{re.escape(allowed_chars)}]')
+
 
 @beartype
 def sanitize_filename(filename: str, repl_char: str = '_', allowed_chars: str = ALLOWED_CHARS) -> str:
@@ -31,7 +74,24 @@ def sanitize_filename(filename: str, repl_char: str = '_', allowed_chars: str =
         str: sanitized filename
 
     """
-    return ''.join((char if char in allowed_chars else repl_char) for char in filename)
+    # Escape backslashes so that `repl_char` is not interpreted as a group reference by `re.sub`
+    return _compile_disallowed(allowed_chars).sub(repl_char.replace('\\', r'\\'), filename)
+
+
+@lru_cache(maxsize=8)
+def _load_yaml(path_yaml: Path, mtime_ns: int) -> Any:
+    """Parse a YAML file once for each modification time.
+
+    Args:
+        path_yaml: path to the YAML file
+        mtime_ns: `st_mtime_ns` of the file. Only used as part of the cache key so that edits are picked up
+
+    Returns:
+        the parsed YAML. Shared between calls, so copy before mutating
+
+    """
+    # Use the libyaml C parser when available, which is much faster than the pure Python `yaml.safe_load`
+    return yaml.load(path_yaml.read_text(), Loader=_SafeLoader)  # noqa: S506
 
 
 @beartype
@@ -52,7 +112,7 @@ def _read_copier_answers(path_copier: Optional[Path] = None) -> Any:
     """
     path_copier = path_copier or Path.cwd() / '.copier-answers.yml'
     try:
-        return yaml.safe_load(path_copier.read_text())
+        return copy.deepcopy(_load_yaml(path_copier, path_copier.stat().st_mtime_ns))
     except (FileNotFoundError, KeyError) as err:  # pragma: no cover
         logger.warning(f'Unexpected error reading the copier file ({path_copier}): {err}')
         return {}
@@ -80,10 +140,12 @@ def get_doc_dir(path_project: Path) -> Path:
 # Read Files
 
 
-@beartype
+@_maybe_beartype
 def read_lines(path_file: Path) -> List[str]:
     """Read a file and split on newlines for later parsing.
 
+    > Note: always decoded as UTF-8 rather than the locale encoding and undecodable bytes are replaced
+
     Args:
         path_file: path to the file
 
@@ -92,17 +154,38 @@ def read_lines(path_file: Path) -> List[str]:
 
     """
     if path_file.is_file():
-        return path_file.read_text().split('\n')
+        return path_file.read_text(encoding='utf-8', errors='replace').split('\n')
     return []
 
 
+@_maybe_beartype
+def iter_lines(path_file: Path) -> Iterator[str]:
+    """Lazily read a file line by line without loading the full file into memory.
+
+    > Note: yields the same lines as `read_lines`, including the final empty string when the file ends with a newline.
+    >   Undecodable bytes are replaced rather than raising a `UnicodeDecodeError`
+
+    Args:
+        path_file: path to the file
+
+    Yields:
+        str: each line of text without the trailing newline
+
+    """
+    if path_file.is_file():
+        with path_file.open('r', encoding='utf-8', errors='replace') as fh:
+            line = '\n'
+            for line in fh:
+                yield line[:-1] if line.endswith('\n') else line
+            if line.endswith('\n'):
+                yield ''
+
+
 @beartype
 def tail_lines(path_file: Path, *, count: int) -> List[str]:
     """Tail a file for up to the last count (or full file) lines.
 
-    Based on: https://stackoverflow.com/a/54278929
-
-    > Tip: `file_size = fh.tell()` -or- `os.fstat(fh.fileno()).st_size` -or- return from `fh.seek(0, os.SEEK_END)`
+    Reads fixed-size blocks backward from the end of the file until enough newlines have been found
 
     Args:
         path_file: path to the file
@@ -112,26 +195,29 @@ def tail_lines(path_file: Path, *, count: int) -> List[str]:
         List[str]: lines of text as list
 
     """
+    block_size = 8192
+    blocks: Deque[bytes] = deque()
+    found_lines = 0
     with open(path_file, 'rb') as fh:
         rem_bytes = fh.seek(0, os.SEEK_END)
-        step_size = 1  # Initially set to 1 so that the last byte is read
-        found_lines = 0
-        while found_lines < count and rem_bytes >= step_size:
-            rem_bytes = fh.seek(-1 * step_size, os.SEEK_CUR)
-            if fh.read(1) == b'\n':
-                found_lines += 1
-            step_size = 2  # Increase so that repeats(read 1 / back 2)
-
-        if rem_bytes < step_size:
-            fh.seek(0, os.SEEK_SET)
-        return [line.rstrip('\r') for line in fh.read().decode().split('\n')]
+        while found_lines < count and rem_bytes > 0:
+            step_size = min(block_size, rem_bytes)
+            rem_bytes = fh.seek(rem_bytes - step_size, os.SEEK_SET)
+            block = fh.read(step_size)
+            found_lines += block.count(b'\n')
+            blocks.appendleft(block)
+    # Only the oldest block can contain extra lines, so trim it before joining rather than slicing the full buffer
+    #   Slicing after a newline also discards a multi-byte character that was cut off by the block
+    if found_lines >= count and blocks:
+        blocks[0] = blocks[0].split(b'\n', found_lines - count + 1)[-1]
+    return [line.rstrip('\r') for line in b''.join(blocks).decode().split('\n')]
 
 
 # ----------------------------------------------------------------------------------------------------------------------
 # Manage Files and Directories
 
 
-@beartype
+@_maybe_beartype
 def if_found_unlink(path_file: Path) -> None:
     """Remove file if it exists. Function is intended to a doit action.
 
@@ -144,6 +230,34 @@ def if_found_unlink(path_file: Path) -> None:
         path_file.unlink()
 
 
+_UNLINK_THREAD_THRESHOLD = 1000
+"""Minimum number of files to delete from a thread pool in `delete_old_files`."""
+
+
+def _scandir_files(dir_path: str) -> Iterator['os.DirEntry[str]']:
+    """Recursively yield the file entries within a directory.
+
+    `os.scandir` entries cache the file type from the directory listing, which avoids the extra `stat` calls and `Path`
+    allocations of `Path.rglob`. Symbolic links to directories are not followed
+
+    Args:
+        dir_path: path to the directory. Missing directories are skipped
+
+    Yields:
+        os.DirEntry: each file entry
+
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_files(entry.path)
+                elif entry.is_file():
+                    yield entry
+    except (FileNotFoundError, NotADirectoryError):
+        return
+
+
 @beartype
 def delete_old_files(dir_path: Path, *, ttl_seconds: int) -> None:
     """Delete old files within the specified directory.
@@ -153,12 +267,18 @@ def delete_old_files(dir_path: Path, *, ttl_seconds: int) -> None:
         ttl_seconds: if last modified within this number of seconds, will not be deleted
 
     """
-    for pth in dir_path.rglob('*'):
-        if pth.is_file() and (time.time() - pth.stat().st_mtime) > ttl_seconds:
-            pth.unlink()
-
-
-@beartype
+    cutoff = time.time() - ttl_seconds
+    paths_old = [entry.path for entry in _scandir_files(str(dir_path)) if entry.stat().st_mtime < cutoff]
+    if len(paths_old) > _UNLINK_THREAD_THRESHOLD:
+        # The GIL is released during the syscall, so threads can overlap the latency of network file systems
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(os.unlink, paths_old))
+    else:
+        for path_old in paths_old:
+            os.unlink(path_old)
+
+
+@_maybe_beartype
 def delete_dir(dir_path: Path) -> None:
     """Delete the specified directory from a doit task.
 
@@ -171,7 +291,7 @@ def delete_dir(dir_path: Path) -> None:
         shutil.rmtree(dir_path)
 
 
-@beartype
+@_maybe_beartype
 def ensure_dir(dir_path: Path) -> None:
     """Make sure that the specified dir_path exists and create any missing folders from a doit task.
 
@@ -181,3 +301,23 @@ def ensure_dir(dir_path: Path) -> None:
     """
     logger.info(f'Creating `{dir_path}`', dir_path=dir_path)
     dir_path.mkdir(parents=True, exist_ok=True)
+
+
+@beartype
+def write_if_changed(path_file: Path, text: str) -> bool:
+    """Write the text to the file only if the content would change.
+
+    Skipping the write keeps the modification time, so tools that watch files or cache on mtime are not triggered
+
+    Args:
+        path_file: path to the file
+        text: full text of the file
+
+    Returns:
+        bool: True if the file was written
+
+    """
+    if path_file.is_file() and path_file.read_text(encoding='utf-8') == text:
+        return False
+    path_file.write_text(text, encoding='utf-8')
+    return True
@@ -3,19 +3,34 @@
 Primarily checking that:
 
 1. No optional dependencies are required
+2. Every name listed in a module's `__all__` can be resolved
 
-FIXME: Replace with programmatic imports? Maybe explicit imports to check backward compatibility of public API?
-    https://stackoverflow.com/questions/34855071/importing-all-functions-from-a-package-from-import
+> Note: only the public entry points are imported rather than walking every submodule with `pkgutil`, because the
+>   submodules of `doit_tasks` intentionally require the optional "dev" extras
 
 """
 
+import importlib
 from pprint import pprint
 
-from calcipy.dev.conftest import *  # noqa: F401, F403, H303
-from calcipy.dev.noxfile import *  # noqa: F401, F403, H303
-from calcipy.doit_tasks import *  # noqa: F401, F403, H303
-from calcipy.file_helpers import *  # noqa: F401, F403, H303
-from calcipy.log_helpers import *  # noqa: F401, F403, H303
-from calcipy.wrappers import *  # noqa: F401, F403, H303
+MODULE_NAMES = [
+    'calcipy.dev.conftest',
+    'calcipy.dev.noxfile',
+    'calcipy.doit_tasks',
+    'calcipy.file_helpers',
+    'calcipy.log_helpers',
+    'calcipy.wrappers',
+]
+"""Modules that users may import from."""
 
-pprint(locals())  # noqa: T003
+public_names = {}
+for module_name in MODULE_NAMES:
+    module = importlib.import_module(module_name)
+    # Equivalent to the check performed by `from module import *`, but without copying every symbol into locals
+    names = getattr(module, '__all__', None) or [name for name in vars(module) if not name.startswith('_')]
+    missing = [name for name in names if not hasattr(module, name)]
+    if missing:
+        raise ImportError(f'{module_name} does not define: {missing}')
+    public_names[module_name] = sorted(names)
+
+pprint(public_names)  # noqa: T003
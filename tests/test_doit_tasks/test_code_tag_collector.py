@@ -1,8 +1,9 @@
 """Test code_tag_collector.py."""
 
-from calcipy.doit_tasks import DG
+from calcipy.doit_tasks import DG, code_tag_collector
 from calcipy.doit_tasks.code_tag_collector import (
-    _CodeTag, _format_report, _search_lines, _Tags, _write_code_tag_file, task_collect_code_tags,
+    SKIP_PHRASE, _CodeTag, _format_report, _search_bytes, _search_file, _search_files, _search_lines, _Tags,
+    _write_code_tag_file, task_collect_code_tags,
 )
 
 from ..configuration import PATH_TEST_PROJECT
@@ -35,6 +36,64 @@ def test_search_lines():
     assert comments[0].text == 'Show README.md in the documentation (may need to update paths?)'
     assert comments[-1].tag == 'FIXME'  # noqa: T100
     assert comments[-1].text == 'and TODO: in the same line, but only match the first'  # noqa: T101
+    assert _search_bytes('\r\n'.join(lines).encode(), regex_compiled, tags=DG.ct.tags) == comments
+    assert DG.ct.compile_issue_regex() is regex_compiled
+
+
+def test_search_skip_phrase():
+    """Test that _search_lines and _search_bytes skip files with the skip phrase in the final two lines."""
+    lines = ['# TODO: Example', '', f'# {SKIP_PHRASE}', '']  # noqa: T101
+    regex_compiled = DG.ct.compile_issue_regex()
+
+    comments = _search_bytes('\n'.join(lines).encode(), regex_compiled, tags=DG.ct.tags)  # act
+
+    assert comments == []
+    assert _search_lines(lines[:-1], regex_compiled) == []
+    assert len(_search_lines([*lines, 'x'], regex_compiled)) == 1
+    assert len(_search_bytes(f'{lines[2]}\n\n\n{lines[0]}'.encode(), regex_compiled, tags=DG.ct.tags)) == 1
+
+
+def test_search_skip_phrase_trailing_newline(fix_test_cache):
+    """Test that only the last line is checked for the skip phrase when the file ends with a newline."""
+    regex_compiled = DG.ct.compile_issue_regex()
+    path_file = fix_test_cache / 'skip_phrase.py'
+    for text, count in [
+        (f'{SKIP_PHRASE} TODO: q\nabc TODO: q\n', 2),  # noqa: T101
+        (f'{SKIP_PHRASE} TODO: q\nabc TODO: q', 0),  # noqa: T101
+        (f'abc TODO: q\n{SKIP_PHRASE}\n', 0),  # noqa: T101
+    ]:
+        path_file.write_text(text)
+
+        comments = _search_file(path_file, regex_compiled)  # act
+
+        assert len(comments) == count
+        assert len(_search_file(path_file, regex_compiled, tags=DG.ct.tags)) == count
+
+
+def test_search_file_carriage_returns(fix_test_cache):
+    """Test that a lone carriage return is a line break when searching the bytes, as in text mode."""
+    regex_compiled = DG.ct.compile_issue_regex()
+    path_file = fix_test_cache / 'carriage_returns.py'
+    path_file.write_bytes(b'x = 1\r# TODO: a\r\n# FIXME: b\rc = 2\r')  # noqa: T100,T101
+
+    comments = _search_file(path_file, regex_compiled, tags=DG.ct.tags)  # act
+
+    assert [(tag.lineno, tag.text) for tag in comments] == [(2, 'a'), (3, 'b')]
+    assert _search_file(path_file, regex_compiled) == comments
+
+
+def test_search_files(monkeypatch):
+    """Test that _search_files returns the same results when searching in parallel."""
+    regex_compiled = DG.ct.compile_issue_regex()
+    paths_source = DG.meta.paths
+    expected = _search_files(paths_source, regex_compiled, tags=DG.ct.tags)
+    monkeypatch.setattr(code_tag_collector, '_PARALLEL_THRESHOLD', 0)
+    monkeypatch.setattr(code_tag_collector, '_CPU_COUNT', 2)
+
+    result = _search_files(paths_source, regex_compiled, tags=DG.ct.tags)  # act
+
+    assert result
+    assert result == expected
 
 
 def test_format_report():
@@ -137,6 +137,29 @@ def test_write_autoformatted_md_sections(fix_test_cache):
     assert '<!-- {cts} SOURCE_FILE_TEST=/tests/conftest.py; -->\n<!-- {cte} -->' not in text
     assert '<!-- {cts} SOURCE_FILE_TEST=/tests/conftest.py; -->\n```py\n"""PyTest configuration."""\n' in text
     assert '<!-- {cts} COVERAGE_TEST -->\n| File | Statements | Missing |' in text
+    assert text.endswith('```\n<!-- {cte} -->\n')
+    #
+    DG.doc.paths_md = paths_original
+    DG.doc.handler_lookup = lookup_original
+
+
+def test_write_autoformatted_md_sections_unchanged(fix_test_cache):
+    """Test that write_autoformatted_md_sections does not rewrite files without changes."""
+    path_plain = fix_test_cache / 'PLAIN.md'
+    path_plain.write_text('# Title\n\nNo autoformatted sections\n')
+    path_user = fix_test_cache / 'USER.md'
+    path_user.write_text('# Title\n\n<!-- {cts} UNKNOWN -->\n')
+    mtimes = [pth.stat().st_mtime_ns for pth in (path_plain, path_user)]
+    #
+    paths_original = DG.doc.paths_md
+    lookup_original = DG.doc.handler_lookup
+    #
+    DG.doc.paths_md = [path_plain, path_user]
+    DG.doc.handler_lookup = {'rating': _star_parser}
+
+    write_autoformatted_md_sections()  # act
+
+    assert [pth.stat().st_mtime_ns for pth in (path_plain, path_user)] == mtimes
     #
     DG.doc.paths_md = paths_original
     DG.doc.handler_lookup = lookup_original
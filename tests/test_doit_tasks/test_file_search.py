@@ -1,7 +1,7 @@
 """Test doit_tasks/file_search.py."""
 
 from calcipy.doit_tasks.doit_globals import DG
-from calcipy.doit_tasks.file_search import find_project_files_by_suffix
+from calcipy.doit_tasks.file_search import _filter_files, find_project_files_by_suffix
 
 
 def test_find_project_files_by_suffix():
@@ -13,3 +13,13 @@ def test_find_project_files_by_suffix():
     assert result[''][0].name == '.flake8'
     assert result[''][2].name == 'LICENSE'
     assert result['md'][0].relative_to(DG.meta.path_project).as_posix() == '.github/ISSUE_TEMPLATE/bug_report.md'
+
+
+def test_filter_files():
+    """Test _filter_files."""
+    rel_filepaths = ['README.md', 'docs/README.md', 'tests/data/a.py', 'tests/test_a.py']
+
+    result = _filter_files(rel_filepaths, ['docs/*', 'tests/data/*'])  # act
+
+    assert result == ['README.md', 'tests/test_a.py']
+    assert _filter_files(rel_filepaths, []) == rel_filepaths
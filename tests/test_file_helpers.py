@@ -1,8 +1,15 @@
 """Test file_helpers."""
 
+import os
 from pathlib import Path
 
-from calcipy.file_helpers import delete_dir, ensure_dir, if_found_unlink, read_lines, sanitize_filename, tail_lines
+import pytest
+
+from calcipy import file_helpers
+from calcipy.file_helpers import (
+    delete_dir, delete_old_files, ensure_dir, get_doc_dir, if_found_unlink, iter_lines, read_lines, sanitize_filename,
+    tail_lines, write_if_changed,
+)
 
 
 def test_sanitize_filename():
@@ -10,6 +17,23 @@ def test_sanitize_filename():
     result = sanitize_filename('_dash-09-ϑ//.// SUPER.py')
 
     assert result == '_dash-09-___.___SUPER.py'
+    assert sanitize_filename('a]b\\c\n', repl_char='\\', allowed_chars='ab]') == 'a]b' + '\\' * 3
+    assert sanitize_filename('abc', allowed_chars='') == '___'
+
+
+def test_get_doc_dir(fix_test_cache):
+    """Test that get_doc_dir reads the copier answers and picks up changes to the file."""
+    path_copier = fix_test_cache / '.copier-answers.yml'
+    path_copier.write_text('doc_dir: first\n')
+
+    result = get_doc_dir(fix_test_cache)  # act
+
+    assert result == fix_test_cache / 'first'
+    assert get_doc_dir(fix_test_cache) == result
+    path_copier.write_text('doc_dir: second\n')
+    stat = path_copier.stat()
+    os.utime(path_copier, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert get_doc_dir(fix_test_cache) == fix_test_cache / 'second'
 
 
 def test_read_lines():
@@ -21,6 +45,36 @@ def test_read_lines():
     assert len(read_lines(Path.cwd() / 'not a file.tbd')) == 0
 
 
+def test_read_lines_encoding(fix_test_cache):
+    """Test that read_lines decodes UTF-8 and replaces invalid bytes."""
+    path_file = fix_test_cache / 'encoding.txt'
+    path_file.write_bytes('caf\u00e9\n'.encode() + b'\xff\n')
+
+    result = read_lines(path_file)  # act
+
+    assert result == ['caf\u00e9', '\ufffd', '']
+
+
+def test_iter_lines():
+    """Test iter_lines."""
+    result = list(iter_lines(Path(__file__).resolve()))
+
+    assert result[0] == '"""Test file_helpers."""'
+    assert result == read_lines(Path(__file__).resolve())
+    assert len(list(iter_lines(Path.cwd() / 'not a file.tbd'))) == 0
+
+
+def test_iter_lines_matches_read_lines(fix_test_cache):
+    """Test that iter_lines yields the same lines as read_lines, including the trailing empty string."""
+    path_file = fix_test_cache / 'iter_lines.txt'
+    for text in ['', '\n', 'a', 'a\n', 'a\n\nb', 'a\r\nb\r\n']:
+        path_file.write_bytes(text.encode())
+
+        result = list(iter_lines(path_file))  # act
+
+        assert result == read_lines(path_file)
+
+
 def test_tail_lines(fix_test_cache):
     """Test tail_lines."""
     path_file = fix_test_cache / 'tmp.txt'
@@ -31,6 +85,22 @@ def test_tail_lines(fix_test_cache):
     assert result == ['']
     assert tail_lines(path_file, count=2) == ['line 2', '']
     assert tail_lines(path_file, count=10) == ['line 1', 'line 2', '']
+    path_file.write_text(''.join(f'line {idx}\r\n' for idx in range(10000)))
+    assert tail_lines(path_file, count=3) == ['line 9998', 'line 9999', '']
+    assert len(tail_lines(path_file, count=20000)) == 10001
+
+
+def test_write_if_changed(fix_test_cache):
+    """Test write_if_changed."""
+    path_file = fix_test_cache / 'write_if_changed-test_file.txt'
+    if_found_unlink(path_file)
+
+    result = write_if_changed(path_file, 'text\n')  # act
+
+    assert result
+    assert not write_if_changed(path_file, 'text\n')
+    assert write_if_changed(path_file, 'new text\n')
+    assert path_file.read_text() == 'new text\n'
 
 
 def test_if_found_unlink(fix_test_cache):
@@ -44,6 +114,26 @@ def test_if_found_unlink(fix_test_cache):
     assert not path_file.is_file()
 
 
+@pytest.mark.parametrize('threshold', [0, 1000])
+def test_delete_old_files(fix_test_cache, monkeypatch, threshold):
+    """Test delete_old_files with and without the thread pool."""
+    monkeypatch.setattr(file_helpers, '_UNLINK_THREAD_THRESHOLD', threshold)
+    tmp_dir = fix_test_cache / '.tmp-test_delete_old_files'
+    (tmp_dir / 'subdir').mkdir(parents=True, exist_ok=True)
+    path_new = tmp_dir / 'new.txt'
+    path_old = tmp_dir / 'subdir' / 'old.txt'
+    for path_file in (path_new, path_old):
+        path_file.write_text('Placeholder\n')
+    os.utime(path_old, (0, 0))
+
+    delete_old_files(tmp_dir, ttl_seconds=3600)  # act
+
+    assert path_new.is_file()
+    assert not path_old.is_file()
+    assert (tmp_dir / 'subdir').is_dir()
+    delete_old_files(tmp_dir / 'missing', ttl_seconds=0)
+
+
 def test_dir_tools(fix_test_cache):
     """Test delete_dir & ensure_dir."""
     tmp_dir = fix_test_cache / '.tmp-test_delete_dir'